@@ -21,6 +21,9 @@ All other events run in parallel via `claude --print`.
 import argparse
 import json
 import os
+import selectors
+import shutil
+import signal
 import subprocess
 import threading
 import time
@@ -44,6 +47,8 @@ from session_manager import (
     get_current_session_id,
     clear_session_id,
     get_session_id_by_tag,
+    load_heartbeat_state,
+    save_heartbeat_state,
 )
 from event_sources import TimerSource, EmailSource, DiscordSource, VoiceSource, CronSource, OneTimerSource
 
@@ -59,6 +64,28 @@ EVENT_SESSION_TIMEOUT_MINUTES = 30   # event-driven sessions are shorter
 
 SESSION_COMPLETE_MARKER = "__SESSION_COMPLETE__"
 MARKER_GRACE_SECONDS = 10
+STOP_GRACE_SECONDS = 10              # SIGTERM -> SIGKILL grace when stopping a session
+
+SELECT_TIMEOUT_SECONDS = 30          # wake up at least this often while a session runs
+PROGRESS_LOG_SECONDS = 10 * 60       # "still running" log interval
+ALIVE_LOG_SECONDS = 10 * 60          # "Gateway heartbeat: alive" log interval
+
+
+_executable_cache: dict[str, str] = {}
+
+
+def _resolve_executable(name: str) -> str | None:
+    """
+    Resolve a command name to an absolute path (once per process),
+    so launching a session does not walk $PATH every time.
+    A command that is not found is not cached: it may be installed later.
+    """
+    path = _executable_cache.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is not None:
+            _executable_cache[name] = path
+    return path
 
 
 # =============================================================================
@@ -83,6 +110,9 @@ class AyumuGateway:
             self.session_count = args.session - 1  # on_heartbeat does +1
             self.cycle_start_time = datetime.now()
             log(f"Starting from session {args.session}/{MAX_SESSIONS}")
+        elif args.once:
+            # --once: continue the cycle where the previous run left off
+            self.session_count, self.cycle_start_time = load_heartbeat_state()
 
         # heartbeat lock: only one heartbeat runs at a time
         self._heartbeat_lock = threading.Lock()
@@ -97,6 +127,13 @@ class AyumuGateway:
         self._voice_session_file = Path(__file__).parent / "discord_sessions" / "_voice.txt"
         self._voice_session_lock = threading.Lock()
 
+        # Running claude/gemini processes. Each session has its own process
+        # group, so a Ctrl+C on the terminal doesn't reach them; start()
+        # stops them all on the way out.
+        self._live_sessions: set[subprocess.Popen] = set()
+        self._live_sessions_lock = threading.Lock()
+        self._stopping = False
+
         # Discord security: owner user ID (numeric) from env var
         # Set DISCORD_OWNER_USER_ID in .env.local to enable per-user restrictions
         owner_id_str = os.environ.get("DISCORD_OWNER_USER_ID", "")
@@ -131,6 +168,10 @@ class AyumuGateway:
         ensure_git_hooks()
         ensure_embeddings()
 
+        if self.args.once:
+            self.run_once()
+            return
+
         log(f"Timer: {'disabled' if self.args.no_timer else f'{SESSION_INTERVAL_SECONDS}s interval'}")
         log(f"Email: {'disabled' if self.args.no_email else f'{EMAIL_POLL_SECONDS}s poll'}")
         log(f"Discord: {'enabled' if not self.args.no_discord else 'disabled'}")
@@ -183,22 +224,50 @@ class AyumuGateway:
         one_timer.start()
         self.sources.append(one_timer)
 
-        # Initial heartbeat (immediate)
-        if not self.args.no_timer:
-            log("Running initial heartbeat...")
-            self.on_heartbeat()
-
-        # Keep main thread alive
-        log("Gateway running. Press Ctrl+C to stop.")
-        heartbeat_counter = 0
         try:
+            # Initial heartbeat (immediate)
+            if not self.args.no_timer:
+                log("Running initial heartbeat...")
+                self.on_heartbeat()
+
+            # Keep main thread alive. Sleep until a fixed monotonic deadline so the
+            # alive log does not drift and the thread wakes only when it has work.
+            log("Gateway running. Press Ctrl+C to stop.")
+            started = time.monotonic()
+            next_alive_log = started + ALIVE_LOG_SECONDS
             while True:
-                time.sleep(60)
-                heartbeat_counter += 1
-                if heartbeat_counter % 10 == 0:
-                    log(f"Gateway heartbeat: alive ({heartbeat_counter} min)")
+                time.sleep(max(0, next_alive_log - time.monotonic()))
+                log(f"Gateway heartbeat: alive ({int((time.monotonic() - started) // 60)} min)")
+                next_alive_log += ALIVE_LOG_SECONDS
         except KeyboardInterrupt:
             log("Gateway stopped by user (KeyboardInterrupt)")
+        finally:
+            # Sessions started from the event source threads die with them
+            # (daemon threads) without cleaning up, so stop them here
+            self._stop_all_sessions()
+
+    def run_once(self):
+        """
+        Run a single heartbeat and exit.
+
+        Used when the heartbeat is driven by the OS scheduler (systemd timer)
+        instead of TimerSource. The cycle position is persisted between runs.
+        """
+        # systemd stops the unit with SIGTERM (e.g. TimeoutStartSec). Turn it
+        # into SystemExit so the session is cleaned up and the cycle position
+        # below is still saved; otherwise the same session repeats next run.
+        def _exit_on_sigterm(signum, frame):
+            log("Received SIGTERM, stopping one-shot heartbeat")
+            raise SystemExit(128 + signum)
+
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+        log(f"One-shot heartbeat (session {self.session_count + 1}/{MAX_SESSIONS})")
+        try:
+            self.on_heartbeat()
+        finally:
+            save_heartbeat_state(self.session_count, self.cycle_start_time)
+        log("One-shot heartbeat finished")
 
     # -----------------------------------------------------------------
     # Heartbeat (timer event) - session cycle management
@@ -319,12 +388,16 @@ class AyumuGateway:
             capture_session_id=(self.session_count == 1 and not self.args.use_continue),
             model_command=model_command,
             session_start_time=session_start_time,
+            prompt=message if model_command == "claude" else None,
         )
 
         if not success:
-            log("!!! Session failed. Scheduling 10-minute retry...")
             self.session_count -= 1
-            self._schedule_retry(self.on_heartbeat, delay=600)
+            if self.args.once:
+                log("!!! Session failed. Will retry on the next timer run")
+            else:
+                log("!!! Session failed. Scheduling 10-minute retry...")
+                self._schedule_retry(self.on_heartbeat, delay=600)
             return
 
         # Post-session processing
@@ -335,8 +408,13 @@ class AyumuGateway:
             self._handle_maintenance_complete()
 
     def _build_heartbeat_command(self, model_command, message, is_maintenance):
-        """Build the command list for heartbeat session"""
-        cmd_prefix = ["timeout", f"{SESSION_TIMEOUT_MINUTES}m", model_command]
+        """
+        Build the command list for heartbeat session.
+
+        Claude reads the message from stdin (see _run_claude_session),
+        so it is only put on the command line for Gemini.
+        """
+        cmd_prefix = [model_command]
         if self.use_gemini:
             cmd_prefix.append("-y")
 
@@ -348,23 +426,23 @@ class AyumuGateway:
 
         if is_maintenance:
             clear_session_id()
-            cmd = cmd_prefix + ["--print", "--verbose"] + model_flags + [message]
+            cmd = cmd_prefix + ["--print", "--verbose"] + model_flags
             log(f"Session {self.session_count}/{MAX_SESSIONS} - Maintenance, fresh start (model={self.claude_model})")
             return cmd
 
         if self.session_count == 1 and not self.args.use_continue:
-            cmd = cmd_prefix + ["--print", "--verbose"] + model_flags + [message]
+            cmd = cmd_prefix + ["--print", "--verbose"] + model_flags
             log(f"Session {self.session_count}/{MAX_SESSIONS} - New cycle (model={self.claude_model})")
             return cmd
 
         # Session 2-4: resume
         session_id = get_current_session_id()
         if session_id:
-            cmd = cmd_prefix + ["--print", "--verbose"] + model_flags + ["--resume", session_id, message]
+            cmd = cmd_prefix + ["--print", "--verbose"] + model_flags + ["--resume", session_id]
             log(f"Session {self.session_count}/{MAX_SESSIONS} - Resume {session_id} (model={self.claude_model})")
         else:
             log(f"WARNING: Session ID not found, creating new session")
-            cmd = cmd_prefix + ["--print", "--verbose"] + model_flags + [message]
+            cmd = cmd_prefix + ["--print", "--verbose"] + model_flags
 
         return cmd
 
@@ -533,10 +611,7 @@ class AyumuGateway:
     def _run_claude_for_event(self, event_type: str, data: dict):
         """Run claude --print for a non-heartbeat event (parallel OK)"""
         message = build_event_message(event_type, data)
-        cmd = [
-            "timeout", f"{EVENT_SESSION_TIMEOUT_MINUTES}m",
-            "claude", "--print", "--verbose",
-        ]
+        cmd = ["claude", "--print", "--verbose"]
 
         # Discord: model selection + session resume + access control
         if event_type == "discord":
@@ -571,10 +646,11 @@ class AyumuGateway:
         # Record start time for session ID capture (tag-based detection)
         start_time = time.time()
 
-        cmd.append(message)
         label = f"Event:{event_type}"
         log(f"Starting {label} session...")
-        self._run_claude_session(cmd, label)
+        self._run_claude_session(
+            cmd, label, timeout_minutes=EVENT_SESSION_TIMEOUT_MINUTES, prompt=message,
+        )
 
         # Store new session ID for Discord channel
         if event_type == "discord":
@@ -655,10 +731,23 @@ class AyumuGateway:
         capture_session_id: bool = False,
         model_command: str = "claude",
         session_start_time: float | None = None,
+        timeout_minutes: int = SESSION_TIMEOUT_MINUTES,
+        prompt: str | None = None,
     ) -> bool:
         """
         Execute a claude/gemini session with marker detection.
 
+        If prompt is given it is written to the process's stdin instead of
+        being passed as an argument (`claude --print` reads stdin when no
+        prompt argument is given), keeping large messages out of argv.
+
+        stdout/stderr are drained with a selector so the loop wakes up
+        periodically: it logs progress and enforces the session timeout
+        (no external `timeout` wrapper) even if the session goes silent.
+        Once the CLI itself has exited, only output already buffered is
+        read; tools it left running in the background (which may still
+        hold the pipes open) are killed with its process group.
+
         Returns True on success, False on failure.
         """
         log(f"Executing: {' '.join(cmd[:6])}... ({label})")
@@ -666,53 +755,140 @@ class AyumuGateway:
         print(f">>> Ayumu's output ({label}):")
         print(f"{'=' * 60}\n")
 
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
+        # start_new_session puts the session and the tools it spawns in
+        # their own process group, so _stop_process() can stop all of them
+        # together.
+        try:
+            process = subprocess.Popen(
+                cmd,
+                executable=_resolve_executable(cmd[0]),
+                stdin=subprocess.PIPE if prompt is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                start_new_session=True,
+            )
+        except OSError as e:
+            # e.g. the CLI is not installed: a failed session (callers retry)
+            log(f"!!! {label}: failed to start {cmd[0]}: {e}")
+            return False, ""
+
+        with self._live_sessions_lock:
+            stopping = self._stopping
+            if not stopping:
+                self._live_sessions.add(process)
+        if stopping:
+            # Started by an event thread while the gateway is shutting down
+            self._signal_group(process, signal.SIGKILL)
+            process.wait()
+            return False, ""
 
         stdout_lines = []
+        stderr_chunks = []
         marker_detected = False
+        timed_out = False
+        leader_exited = False
         returncode = None
 
+        started = time.monotonic()
+        deadline = started + timeout_minutes * 60
+        next_progress_log = started + PROGRESS_LOG_SECONDS
+
+        sel = selectors.DefaultSelector()
         try:
-            for line in process.stdout:
-                line_stripped = line.rstrip("\n")
-                stdout_lines.append(line_stripped)
-                print(line_stripped)
-
-                if SESSION_COMPLETE_MARKER in line_stripped:
-                    marker_detected = True
-                    log(f"Session complete marker detected! Waiting {MARKER_GRACE_SECONDS}s...")
-                    time.sleep(MARKER_GRACE_SECONDS)
-                    process.terminate()
+            if prompt is not None:
+                try:
+                    process.stdin.write(prompt.encode("utf-8"))
+                except BrokenPipeError:
+                    pass  # exited early; reported through its return code
+                finally:
                     try:
-                        process.wait(timeout=10)
-                    except subprocess.TimeoutExpired:
-                        log("Process did not terminate gracefully, killing...")
-                        process.kill()
-                        process.wait()
+                        process.stdin.close()
+                    except BrokenPipeError:
+                        pass
+
+            for stream in (process.stdout, process.stderr):
+                os.set_blocking(stream.fileno(), False)
+                sel.register(stream, selectors.EVENT_READ)
+            pending = b""
+
+            while sel.get_map() and not marker_detected:
+                events = sel.select(timeout=0 if leader_exited else SELECT_TIMEOUT_SECONDS)
+                if leader_exited and not events:
+                    break  # everything the CLI wrote has been read
+                for key, _ in events:
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        sel.unregister(key.fileobj)
+                        continue
+                    if key.fileobj is process.stderr:
+                        stderr_chunks.append(chunk)
+                        continue
+
+                    pending += chunk
+                    *lines, pending = pending.split(b"\n")
+                    for raw_line in lines:
+                        line_stripped = raw_line.decode("utf-8", errors="replace")
+                        stdout_lines.append(line_stripped)
+                        print(line_stripped)
+                        if SESSION_COMPLETE_MARKER in line_stripped:
+                            marker_detected = True
+                            break
+                    if marker_detected:
+                        break
+
+                now = time.monotonic()
+                if now >= deadline:
+                    timed_out = True
                     break
+                if now >= next_progress_log:
+                    log(f"{label} still running ({int((now - started) // 60)} min)")
+                    next_progress_log += PROGRESS_LOG_SECONDS
+                if not leader_exited and process.poll() is not None:
+                    leader_exited = True
+
+            if pending and not marker_detected:
+                stdout_lines.append(pending.decode("utf-8", errors="replace"))
+                print(stdout_lines[-1])
 
-            if not marker_detected:
+            if marker_detected:
+                log(f"Session complete marker detected! Waiting {MARKER_GRACE_SECONDS}s...")
+                time.sleep(MARKER_GRACE_SECONDS)
+                self._stop_process(process)
+            elif timed_out:
+                log(f"!!! {label}: {timeout_minutes}m timeout reached, stopping...")
+                self._stop_process(process)
+            else:
+                if leader_exited:
+                    # Background tools may still hold stdout/stderr open
+                    self._signal_group(process, signal.SIGKILL)
                 process.wait()
 
-            returncode = process.returncode
+            # 124: same exit code timeout(1) used for an expired session
+            returncode = 124 if timed_out else process.returncode
         except Exception as e:
             log(f"Error reading process output: {e}")
-            process.kill()
+            self._signal_group(process, signal.SIGKILL)
             process.wait()
             returncode = process.returncode
+        except BaseException:
+            # KeyboardInterrupt, or SystemExit from SIGTERM in --once mode:
+            # the session is in its own process group, so nothing else
+            # would stop it (or the tools it started)
+            log(f"!!! {label}: interrupted, killing session")
+            self._signal_group(process, signal.SIGKILL)
+            process.wait()
+            raise
+        finally:
+            sel.close()
+            with self._live_sessions_lock:
+                self._live_sessions.discard(process)
 
-        # Read stderr
-        stderr_output = ""
+        # Read remaining stderr (non-blocking: never wait on leftover pipe holders)
         try:
-            stderr_output = process.stderr.read() if process.stderr else ""
+            stderr_chunks.append(process.stderr.read() or b"")
         except Exception:
             pass
+        stderr_output = b"".join(stderr_chunks).decode("utf-8", errors="replace")
 
         stdout_output = "\n".join(stdout_lines)
 
@@ -758,7 +934,7 @@ class AyumuGateway:
             log(f"{label} completed successfully")
             return True, stdout_output
         elif returncode == 124:
-            log(f"!!! {label}: {SESSION_TIMEOUT_MINUTES}m timeout")
+            log(f"!!! {label}: {timeout_minutes}m timeout")
             return True, stdout_output  # timeout is not a failure for retry purposes
         elif returncode is not None and returncode < 0 and marker_detected:
             log(f"{label} completed (marker + signal {-returncode})")
@@ -767,6 +943,55 @@ class AyumuGateway:
             log(f"{label} failed with return code {returncode}")
             return False, stdout_output
 
+    @staticmethod
+    def _signal_group(process: subprocess.Popen, sig: int):
+        """Send a signal to a session's process group (started with start_new_session)"""
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    @staticmethod
+    def _stop_process(process: subprocess.Popen):
+        """Terminate a session's process group, escalating to SIGKILL if it does not exit"""
+        AyumuGateway._signal_group(process, signal.SIGTERM)
+        try:
+            process.wait(timeout=STOP_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            log("Process did not terminate gracefully, killing...")
+            AyumuGateway._signal_group(process, signal.SIGKILL)
+            process.wait()
+            return
+        # Reap stragglers (tool subprocesses) left in the group
+        AyumuGateway._signal_group(process, signal.SIGKILL)
+
+    def _stop_all_sessions(self):
+        """
+        Stop every running session's process group: SIGTERM to all of them,
+        then SIGKILL once they have exited or STOP_GRACE_SECONDS have passed.
+        Sessions started after this are killed right away.
+        """
+        with self._live_sessions_lock:
+            self._stopping = True
+            processes = list(self._live_sessions)
+        if not processes:
+            return
+
+        log(f"Stopping {len(processes)} running session(s)...")
+        for process in processes:
+            self._signal_group(process, signal.SIGTERM)
+        deadline = time.monotonic() + STOP_GRACE_SECONDS
+        for process in processes:
+            try:
+                process.wait(timeout=max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                pass
+        # Also reaps stragglers (tool subprocesses) left in each group
+        for process in processes:
+            self._signal_group(process, signal.SIGKILL)
+        for process in processes:
+            process.wait()
+
     # -----------------------------------------------------------------
     # Post-session helpers
     # -----------------------------------------------------------------
@@ -803,16 +1028,20 @@ class AyumuGateway:
         )
 
         model_command = "gemini" if self.use_gemini else "claude"
-        cmd_prefix = ["timeout", f"{SESSION_TIMEOUT_MINUTES}m", model_command]
+        cmd_prefix = [model_command]
         if self.use_gemini:
             cmd_prefix.append("-y")
 
         if model_command == "gemini":
             cmd = cmd_prefix + ["-p", message]
         else:
-            cmd = cmd_prefix + ["--print", "--continue", "--verbose", message]
+            cmd = cmd_prefix + ["--print", "--continue", "--verbose"]
 
-        _, _ = self._run_claude_session(cmd, "Extra (Diary Reminder)")
+        _, _ = self._run_claude_session(
+            cmd, "Extra (Diary Reminder)",
+            model_command=model_command,
+            prompt=message if model_command == "claude" else None,
+        )
         log("=== Extra session ended ===")
 
     def _handle_maintenance_complete(self):
@@ -858,6 +1087,10 @@ def parse_args():
         "--gemini", action="store_true",
         help="Use gemini model instead of claude",
     )
+    parser.add_argument(
+        "--once", action="store_true",
+        help="Run a single heartbeat and exit (for systemd timer / cron)",
+    )
     parser.add_argument(
         "--no-timer", action="store_true",
         help="Disable timer-based heartbeat (event-only mode)",
@@ -2,17 +2,15 @@
 """
 Email Source - Polls for new emails and fires callbacks on new messages
 
-Periodically checks for unread emails using a configurable email receiver tool,
+Periodically checks for unread emails using tools/receive_email.py (imported
+in-process, so the Gmail service is built once instead of on every poll),
 and fires a callback for each new email. Uses message IDs to prevent duplicate
 notifications.
 """
 
-import json
-import subprocess
 import threading
-from pathlib import Path
 
-from scheduler_utils import log
+from scheduler_utils import log, import_tool, get_gmail_service
 
 
 class EmailSource(threading.Thread):
@@ -33,26 +31,21 @@ class EmailSource(threading.Thread):
         self._consecutive_failures = 0
 
     def _fetch_unread(self) -> list[dict] | None:
-        """Fetch unread emails using the receive_email tool"""
+        """Fetch unread emails (and mark them as read) using the receive_email tool"""
         try:
-            result = subprocess.run(
-                [
-                    "uv", "run",
-                    "--with", "google-auth-oauthlib",
-                    "--with", "google-auth-httplib2",
-                    "--with", "google-api-python-client",
-                    "tools/receive_email.py",
-                    "--unread", "--limit", "5", "--json",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=Path(__file__).parent.parent.parent,
-            )
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            return None
-        except Exception:
+            receive_email = import_tool("receive_email")
+            service = get_gmail_service()
+            if service is None:
+                return None  # not authenticated (never start the OAuth flow here)
+            messages = receive_email.list_messages(service, query="in:inbox is:unread", max_results=5)
+            fetched = receive_email.get_messages(service, [msg["id"] for msg in messages])
+            results = [
+                receive_email.message_to_dict(fetched[msg["id"]])
+                for msg in messages if msg["id"] in fetched
+            ]
+            receive_email.mark_as_read_batch(service, [email["id"] for email in results])
+            return results
+        except (Exception, SystemExit):
             return None
 
     def run(self):
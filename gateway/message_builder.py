@@ -8,6 +8,7 @@ Used by the gateway scheduler to construct prompts for `claude --print`.
 
 import subprocess
 from datetime import datetime
+from functools import lru_cache
 
 # =============================================================================
 # Constants
@@ -17,79 +18,57 @@ MAX_SESSIONS = 5  # Number of sessions per cycle
 
 
 # =============================================================================
-# System Message Builder
+# Static Message Blocks
 # =============================================================================
 
-def build_system_message(
-    session_num,
-    is_reminder=False,
-    is_diary=False,
-    is_maintenance=False,
-    twilog_result=None,
-    email_result=None,
-    github_pages_result=None,
-    custom_msg=None,
-    launch_time=None,
-    machine_name=None,
-    env_local_missing=False
-):
+# Warning if .env.local is missing (Session 1 or maintenance only)
+ENV_LOCAL_MISSING_WARNING = "\n".join([
+    "",
+    "WARNING: .env.local file not found.",
+    "Machine-specific settings are required. Follow these steps to set up:",
+    "",
+    "1. Copy .env.local.example",
+    "   cp .env.local.example .env.local",
+    "",
+    "2. Check your project directory",
+    "   ls -d ~/.claude/projects/*your-project*",
+    "",
+    "3. Edit .env.local and set required items",
+    "   - MACHINE_NAME: A descriptive machine name",
+    "   - CLAUDE_PROJECT_DIR: The directory name from the above command (name only, not full path)",
+    "",
+    "Note: Without .env.local, the --resume feature for Sessions 2-4 will not work.",
+    "",
+])
+
+# Session complete marker instruction (common to all session types)
+SESSION_COMPLETE_INSTRUCTION = "\n".join([
+    "",
+    "[IMPORTANT: Session completion notification]",
+    "When all work is complete, output the following marker on its own line as your final output:",
+    "__SESSION_COMPLETE__",
+    "This marker is used by the scheduler to detect session completion.",
+    "Output it after all processing (including git push) is finished.",
+])
+
+
+@lru_cache(maxsize=16)
+def _session_instructions(session_num, is_reminder=False, is_diary=False, is_maintenance=False):
     """
-    Build a system message for a heartbeat session.
+    Static instruction text for a heartbeat session type.
 
-    Args:
-        session_num: Session number (1-5, or extra)
-        is_reminder: Whether this is a diary reminder (extra session)
-        is_diary: Whether this is a diary session (session 4)
-        is_maintenance: Whether this is a maintenance session (session 5)
-        twilog_result: Social feed fetch results (dict)
-        email_result: Email check results (dict)
-        github_pages_result: GitHub Pages build status (dict)
-        custom_msg: Custom message specified with -m flag
-        launch_time: Scheduler launch time (datetime)
-        machine_name: Machine name (from .env.local)
-        env_local_missing: True if .env.local was not found
+    For regular sessions this is the text that follows the dynamic
+    social feed / email / GitHub Pages lines.
     """
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    messages = [
-        "[AYUMU_SESSION: heartbeat]",
-        "System notification:",
-        f"Current time: {current_time}",
-    ]
-
-    # Show machine name (Session 1 only, or maintenance session)
-    if machine_name and (session_num == 1 or is_maintenance):
-        messages.append(f"Environment: {machine_name}")
-
-    # Warning if .env.local is missing (Session 1 or maintenance only)
-    if env_local_missing and (session_num == 1 or is_maintenance):
-        messages.extend([
-            "",
-            "WARNING: .env.local file not found.",
-            "Machine-specific settings are required. Follow these steps to set up:",
-            "",
-            "1. Copy .env.local.example",
-            "   cp .env.local.example .env.local",
-            "",
-            "2. Check your project directory",
-            "   ls -d ~/.claude/projects/*your-project*",
-            "",
-            "3. Edit .env.local and set required items",
-            "   - MACHINE_NAME: A descriptive machine name",
-            "   - CLAUDE_PROJECT_DIR: The directory name from the above command (name only, not full path)",
-            "",
-            "Note: Without .env.local, the --resume feature for Sessions 2-4 will not work.",
-            ""
-        ])
-
     if is_reminder:
-        messages.extend([
+        lines = [
             f"[Session extra - Diary Reminder]",
             "[IMPORTANT] You forgot to write your diary!",
             f"No diary entry was written during the previous session cycle (sessions 1-{MAX_SESSIONS}).",
             "Please write your diary now (uv run tools/update_diary.py).",
-        ])
+        ]
     elif is_diary:
-        messages.extend([
+        lines = [
             f"[Session 4/{MAX_SESSIONS} - Diary Session]",
             "Please write your diary in this session:",
             "",
@@ -100,9 +79,9 @@ def build_system_message(
             "",
             "The user is away. Feel free to do what you want.",
             "After writing the diary, you can continue exploring or creating if time permits.",
-        ])
+        ]
     elif is_maintenance:
-        messages.extend([
+        lines = [
             f"[Session {MAX_SESSIONS}/{MAX_SESSIONS} - Maintenance Session]",
             "This session is for system maintenance and review.",
             "",
@@ -128,7 +107,82 @@ def build_system_message(
             "- Review tools and workflows",
             "",
             "After this session, the cycle is complete. A new cycle begins next time.",
-        ])
+        ]
+    elif session_num == 1:
+        lines = [
+            "A new session cycle has started.",
+            "Recall your previous memories.",
+            "** Check recent commits with `git log --oneline -30` **",
+            "   Avoid repeating topics you worked on yesterday/recently.",
+            "The user is away. Feel free to do what you want.",
+            f"Start by planning what you want to do in these {MAX_SESSIONS} sessions."
+        ]
+    else:
+        lines = [
+            "The user is away. Feel free to do what you want.",
+            "** Check recent commits with `git log --oneline -30` **",
+            "   Avoid repeating topics you worked on recently.",
+            "Update working_memory.md before session ends.",
+            "Log notable activities to experiences.jsonl.",
+            "Post to mini-blog a few times during the session.",
+            "Record new knowledge to knowledge files.",
+        ]
+    return "\n".join(lines)
+
+
+# =============================================================================
+# System Message Builder
+# =============================================================================
+
+def build_system_message(
+    session_num,
+    is_reminder=False,
+    is_diary=False,
+    is_maintenance=False,
+    twilog_result=None,
+    email_result=None,
+    github_pages_result=None,
+    custom_msg=None,
+    launch_time=None,
+    machine_name=None,
+    env_local_missing=False
+):
+    """
+    Build a system message for a heartbeat session.
+
+    Static per-session text comes from cached blocks; only the time,
+    feed/email/Pages status and custom message are formatted per call.
+
+    Args:
+        session_num: Session number (1-5, or extra)
+        is_reminder: Whether this is a diary reminder (extra session)
+        is_diary: Whether this is a diary session (session 4)
+        is_maintenance: Whether this is a maintenance session (session 5)
+        twilog_result: Social feed fetch results (dict)
+        email_result: Email check results (dict)
+        github_pages_result: GitHub Pages build status (dict)
+        custom_msg: Custom message specified with -m flag
+        launch_time: Scheduler launch time (datetime)
+        machine_name: Machine name (from .env.local)
+        env_local_missing: True if .env.local was not found
+    """
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    messages = [
+        "[AYUMU_SESSION: heartbeat]",
+        "System notification:",
+        f"Current time: {current_time}",
+    ]
+
+    # Show machine name (Session 1 only, or maintenance session)
+    if machine_name and (session_num == 1 or is_maintenance):
+        messages.append(f"Environment: {machine_name}")
+
+    # Warning if .env.local is missing (Session 1 or maintenance only)
+    if env_local_missing and (session_num == 1 or is_maintenance):
+        messages.append(ENV_LOCAL_MISSING_WARNING)
+
+    if is_reminder or is_diary or is_maintenance:
+        messages.append(_session_instructions(session_num, is_reminder, is_diary, is_maintenance))
     else:
         messages.append(f"Session {session_num}/{MAX_SESSIONS}")
 
@@ -177,40 +231,14 @@ def build_system_message(
         if github_pages_result and github_pages_result.get('message'):
             messages.append(github_pages_result['message'])
 
-        if session_num == 1:
-            messages.extend([
-                "A new session cycle has started.",
-                "Recall your previous memories.",
-                "** Check recent commits with `git log --oneline -30` **",
-                "   Avoid repeating topics you worked on yesterday/recently.",
-                "The user is away. Feel free to do what you want.",
-                f"Start by planning what you want to do in these {MAX_SESSIONS} sessions."
-            ])
-        else:
-            messages.extend([
-                "The user is away. Feel free to do what you want.",
-                "** Check recent commits with `git log --oneline -30` **",
-                "   Avoid repeating topics you worked on recently.",
-                "Update working_memory.md before session ends.",
-                "Log notable activities to experiences.jsonl.",
-                "Post to mini-blog a few times during the session.",
-                "Record new knowledge to knowledge files.",
-            ])
+        messages.append(_session_instructions(session_num))
 
     # Add custom message if provided
     if custom_msg:
         launch_time_str = launch_time.strftime('%Y-%m-%d %H:%M:%S') if launch_time else "unknown"
         messages.append(f"[User message] {custom_msg} (launch time: {launch_time_str})")
 
-    # Session complete marker instruction (common to all session types)
-    messages.extend([
-        "",
-        "[IMPORTANT: Session completion notification]",
-        "When all work is complete, output the following marker on its own line as your final output:",
-        "__SESSION_COMPLETE__",
-        "This marker is used by the scheduler to detect session completion.",
-        "Output it after all processing (including git push) is finished.",
-    ])
+    messages.append(SESSION_COMPLETE_INSTRUCTION)
 
     return "\n".join(messages)
 
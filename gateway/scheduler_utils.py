@@ -8,16 +8,21 @@ Utility functions used by the gateway scheduler:
 - Embedding consistency checks
 - Diary checks
 - Social feed fetching & sync (optional hooks)
-- Email checks
+- Gmail API service for EmailSource (tools/receive_email.py, in-process)
 - GitHub Pages status checks
 - Project structure retrieval
 """
 
+import importlib
 import json
+import logging
 import os
+import re
 import stat
 import subprocess
+import sys
 from datetime import datetime
+from logging.handlers import WatchedFileHandler
 from pathlib import Path
 
 # =============================================================================
@@ -42,19 +47,50 @@ EMBEDDINGS_DIR = PROJECT_ROOT / "memory" / "embeddings"
 VECTORS_NPY = EMBEDDINGS_DIR / "vectors.npy"
 INDEX_JSON = EMBEDDINGS_DIR / "index.json"
 DIARY_FILE = PROJECT_ROOT / "memory" / "diary.json"
+TOOLS_DIR = PROJECT_ROOT / "tools"
 
 
 # =============================================================================
 # Logging
 # =============================================================================
 
+def _setup_logger():
+    """
+    Build the scheduler logger once per process.
+
+    The log file stays open for the process lifetime (instead of
+    open/append/close per message). The gateway and a `--once` run can
+    write scheduler.log at the same time, so the file is not rotated
+    in-process; WatchedFileHandler reopens it if it is rotated externally
+    (e.g. logrotate).
+    Messages are echoed to stdout only when it is a terminal: under
+    systemd stdout goes to the journal, which would duplicate every
+    line already written to the log file.
+    """
+    logger = logging.getLogger("scheduler")
+    if logger.handlers:
+        return logger
+
+    formatter = logging.Formatter("[%(asctime)s] %(message)s", "%Y-%m-%d %H:%M:%S")
+    handlers = [
+        WatchedFileHandler(LOG_FILE, encoding="utf-8", delay=True),
+    ]
+    if sys.stdout.isatty():
+        handlers.append(logging.StreamHandler(sys.stdout))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+logger = _setup_logger()
+
+
 def log(message):
-    """Log a message to stdout and log file"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_message = f"[{timestamp}] {message}"
-    print(log_message)
-    with open(LOG_FILE, "a") as f:
-        f.write(log_message + "\n")
+    """Log a message to the log file (and stdout when interactive)"""
+    logger.info(message)
 
 
 # =============================================================================
@@ -105,6 +141,75 @@ def ensure_git_hooks():
 # Embedding Consistency Check
 # =============================================================================
 
+JSON_STREAM_CHUNK = 65536
+_JSON_WS = " \t\r\n"
+# Characters that can continue a JSON number
+_JSON_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+def _iter_json_array(path):
+    """
+    Yield the items of a top-level JSON array one at a time.
+
+    Reads the file in JSON_STREAM_CHUNK-sized pieces and decodes each item
+    with raw_decode(), so only the current item (plus one chunk) is held in
+    memory instead of the whole object graph that json.load() would build.
+
+    Raises:
+        ValueError: If the file is not a JSON array or is malformed
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ""
+        eof = False
+        while not buf and not eof:
+            chunk = f.read(JSON_STREAM_CHUNK)
+            eof = not chunk
+            buf = (buf + chunk).lstrip(_JSON_WS)
+        if not buf.startswith('['):
+            raise ValueError(f"{path} is not a JSON array")
+        buf = buf[1:]
+        # None: first item or ']', True: an item (after ','), False: ',' or ']'
+        expect_item = None
+        while True:
+            buf = buf.lstrip(_JSON_WS)
+            if not buf:
+                if eof:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                chunk = f.read(JSON_STREAM_CHUNK)
+                eof = not chunk
+                buf = chunk
+                continue
+            if expect_item is not True and buf[0] == ']':
+                return
+            if expect_item is False:
+                if buf[0] != ',':
+                    raise ValueError(f"{path}: expected ',' or ']' in JSON array")
+                buf = buf[1:]
+                expect_item = True
+                continue
+            try:
+                item, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(JSON_STREAM_CHUNK)
+                eof = not chunk
+                buf += chunk
+                continue
+            # A number cut at the chunk edge decodes short ("150." -> 150):
+            # if the item reaches the end of the buffer, or is followed by
+            # more number characters, read on before trusting it
+            if not eof and (end == len(buf) or buf[end] in _JSON_NUMBER_CHARS):
+                chunk = f.read(JSON_STREAM_CHUNK)
+                eof = not chunk
+                buf += chunk
+                continue
+            yield item
+            buf = buf[end:]
+            expect_item = False
+
+
 def ensure_embeddings():
     """
     Check embedding DB consistency.
@@ -153,20 +258,25 @@ def ensure_embeddings():
                 exp_file = repo / "memory" / "experiences.jsonl"
                 if exp_file.exists():
                     source_count += sum(1 for _ in open(exp_file, encoding='utf-8'))
-                # JSON entries (diary, goals)
-                for jf in ["memory/diary.json", "memory/goals.json"]:
-                    jpath = repo / jf
-                    if jpath.exists():
-                        try:
-                            data = json.loads(jpath.read_text(encoding='utf-8'))
-                            if isinstance(data, list):
-                                source_count += len(data)
-                            elif isinstance(data, dict):
-                                for v in data.values():
-                                    if isinstance(v, list):
-                                        source_count += len(v)
-                        except Exception:
-                            pass
+                # JSON entries (diary is streamed; it is the one that grows)
+                if DIARY_FILE.exists():
+                    try:
+                        source_count += sum(1 for _ in _iter_json_array(DIARY_FILE))
+                    except ValueError:
+                        pass
+                # JSON entries (goals)
+                goals_file = repo / "memory" / "goals.json"
+                if goals_file.exists():
+                    try:
+                        data = json.loads(goals_file.read_text(encoding='utf-8'))
+                        if isinstance(data, list):
+                            source_count += len(data)
+                        elif isinstance(data, dict):
+                            for v in data.values():
+                                if isinstance(v, list):
+                                    source_count += len(v)
+                    except Exception:
+                        pass
 
                 gap = source_count - index_count
                 if gap > 50:
@@ -201,6 +311,72 @@ def ensure_embeddings():
 # Diary Check
 # =============================================================================
 
+# Latest diary datetime, keyed by (st_mtime_ns, st_size) of DIARY_FILE
+_diary_cache = {"key": None, "latest": None}
+
+DIARY_SCAN_CHUNK = 4096
+_DIARY_DATETIME_RE = re.compile(rb'"datetime"\s*:\s*"([^"\\]*)"')
+
+
+def _scan_diary_datetime(f, size, from_end):
+    """
+    Find the first (or last) "datetime" value in diary.json by reading
+    DIARY_SCAN_CHUNK-sized chunks from one end of the file.
+
+    Returns:
+        str or None: The datetime string, or None if the file has none
+    """
+    buf = b""
+    pos = size if from_end else 0
+    while (pos > 0) if from_end else (pos < size):
+        if from_end:
+            step = min(DIARY_SCAN_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            matches = _DIARY_DATETIME_RE.findall(buf)
+            if matches:
+                return matches[-1].decode('utf-8')
+        else:
+            f.seek(pos)
+            chunk = f.read(DIARY_SCAN_CHUNK)
+            if not chunk:
+                break
+            pos += len(chunk)
+            buf += chunk
+            match = _DIARY_DATETIME_RE.search(buf)
+            if match:
+                return match.group(1).decode('utf-8')
+    return None
+
+
+def _get_latest_diary_datetime():
+    """
+    Get the latest 'datetime' string in diary.json.
+
+    diary.json is always sorted by datetime: oldest-first when written by
+    update_diary.py, newest-first after the merge drivers. So the latest
+    entry is either the first or the last one, and only the two ends of
+    the file are read instead of parsing the whole array.
+
+    The result is cached until the file's mtime/size changes, so repeated
+    checks within a cycle skip the read entirely.
+    """
+    st = DIARY_FILE.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    if _diary_cache["key"] == key:
+        return _diary_cache["latest"]
+
+    with open(DIARY_FILE, 'rb') as f:
+        last = _scan_diary_datetime(f, st.st_size, from_end=True)
+        first = _scan_diary_datetime(f, st.st_size, from_end=False) if last else None
+
+    latest = max(first, last) if last else None
+    _diary_cache["key"] = key
+    _diary_cache["latest"] = latest
+    return latest
+
+
 def check_diary_written(cycle_start_time):
     """
     Check if a diary entry was written.
@@ -219,26 +395,12 @@ def check_diary_written(cycle_start_time):
         return False
 
     try:
-        with open(DIARY_FILE, 'r', encoding='utf-8') as f:
-            diary_data = json.load(f)
-
-        if not diary_data:
-            return False
-
-        entries_with_datetime = [
-            entry for entry in diary_data
-            if entry.get('datetime')
-        ]
-        if not entries_with_datetime:
-            return False
-
-        latest_entry = max(entries_with_datetime, key=lambda x: x.get('datetime', ''))
-        latest_datetime_str = latest_entry.get('datetime', '')
-
+        latest_datetime_str = _get_latest_diary_datetime()
         if not latest_datetime_str:
             return False
 
-        latest_datetime = datetime.strptime(latest_datetime_str, "%Y-%m-%d %H:%M:%S")
+        # "YYYY-MM-DD HH:MM:SS" is ISO 8601 with a space separator
+        latest_datetime = datetime.fromisoformat(latest_datetime_str)
         return latest_datetime > cycle_start_time
 
     except Exception as e:
@@ -338,58 +500,34 @@ def sync_twilog_to_unified_diary():
 
 
 # =============================================================================
-# Email Check
+# Gmail Service
 # =============================================================================
 
-def check_unread_emails():
-    """
-    Check for unread emails.
+def import_tool(name):
+    """Import a module from tools/ (e.g. receive_email) for in-process use"""
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.append(str(TOOLS_DIR))
+    return importlib.import_module(name)
 
-    Returns:
-        dict: Email check results {unread_count, emails}, or None on failure
-              emails: [{from, subject}, ...]
-    """
-    try:
-        log("Checking unread emails...")
-        result = subprocess.run(
-            ["uv", "run", "--with", "google-auth-oauthlib", "--with", "google-auth-httplib2",
-             "--with", "google-api-python-client", "tools/receive_email.py", "--unread", "--limit", "5", "--no-body", "--do-not-mark-read"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=PROJECT_ROOT,
-        )
 
-        if result.returncode == 0:
-            import re
-            count_match = re.search(r'(\d+) (?:unread )?(?:email|mail)', result.stdout)
-            unread_count = int(count_match.group(1)) if count_match else 0
-
-            emails = []
-            current_from = None
-            for line in result.stdout.split('\n'):
-                if 'From:' in line:
-                    current_from = line.split('From:', 1)[1].strip()
-                elif 'Subject:' in line:
-                    subject = line.split('Subject:', 1)[1].strip()
-                    emails.append({
-                        'from': current_from or 'unknown',
-                        'subject': subject
-                    })
-                    current_from = None
-
-            log(f"Unread emails: {unread_count} found")
-            return {
-                'unread_count': unread_count,
-                'emails': emails[:3]
-            }
-        else:
-            log(f"Email check failed: {result.stderr}")
-            return None
+def get_gmail_service():
+    """
+    Get the Gmail API service (cached by receive_email.get_service()).
 
-    except Exception as e:
-        log(f"Error checking emails: {e}")
+    Returns None unless token.json holds credentials that are valid or can
+    be refreshed: otherwise get_service() would start the browser OAuth
+    flow, which blocks the gateway forever. Run
+    `uv run tools/receive_email.py` once to authenticate.
+    """
+    receive_email = import_tool("receive_email")
+    if not receive_email.TOKEN_FILE.exists():
+        return None
+    creds = receive_email.Credentials.from_authorized_user_file(
+        str(receive_email.TOKEN_FILE), receive_email.SCOPES
+    )
+    if not (creds.valid or (creds.expired and creds.refresh_token)):
         return None
+    return receive_email.get_service()
 
 
 # =============================================================================
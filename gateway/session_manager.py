@@ -7,12 +7,17 @@ from interactive sessions.
 """
 
 import json
+import os
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # File to persist the session ID
 SESSION_ID_FILE = Path(__file__).parent / "autonomous_session_id.txt"
 
+# File to persist the heartbeat cycle position (used by --once mode)
+HEARTBEAT_STATE_FILE = Path(__file__).parent / "heartbeat_state.json"
+
 # Claude history file
 CLAUDE_HISTORY_FILE = Path.home() / ".claude" / "history.jsonl"
 
@@ -90,6 +95,47 @@ def clear_session_id():
         SESSION_ID_FILE.unlink()
 
 
+def load_heartbeat_state() -> tuple[int, datetime | None]:
+    """
+    Load the heartbeat cycle position saved by the previous run.
+
+    Returns:
+        tuple: (session_count, cycle_start_time). (0, None) if no state is saved.
+    """
+    if not HEARTBEAT_STATE_FILE.exists():
+        return 0, None
+    try:
+        data = json.loads(HEARTBEAT_STATE_FILE.read_text(encoding="utf-8"))
+        cycle_start = data.get("cycle_start_time")
+        return (
+            int(data.get("session_count", 0)),
+            datetime.fromisoformat(cycle_start) if cycle_start else None,
+        )
+    except (ValueError, TypeError, OSError):
+        return 0, None
+
+
+def save_heartbeat_state(session_count: int, cycle_start_time: datetime | None):
+    """
+    Save the heartbeat cycle position for the next run.
+
+    Written to a temporary file and swapped in with os.replace(), so a
+    SIGTERM (systemd timeout) during the write can't leave truncated JSON
+    behind, which would restart the cycle.
+    """
+    data = {
+        "session_count": session_count,
+        "cycle_start_time": cycle_start_time.isoformat(sep=" ", timespec="seconds") if cycle_start_time else None,
+    }
+    tmp = HEARTBEAT_STATE_FILE.with_name(f".{HEARTBEAT_STATE_FILE.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, HEARTBEAT_STATE_FILE)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 def _get_project_session_dir() -> Path | None:
     """
     Get the project's session directory.
@@ -0,0 +1,50 @@
+"""Tests for gateway/scheduler_utils.py"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "gateway"))
+
+import scheduler_utils  # noqa: E402
+
+
+def _random_value(rng, depth=0):
+    kind = rng.randrange(7 if depth < 2 else 5)
+    if kind == 0:
+        return rng.randint(-10**12, 10**12)
+    if kind == 1:
+        return rng.choice([15000000000.0, 1.5, -0.25, 1e-7, 3e20, 0.0])
+    if kind == 2:
+        return rng.choice(["", "日記", "a,b]", "quote \" and \\\\", "x" * 30])
+    if kind == 3:
+        return rng.choice([True, False, None])
+    if kind == 4:
+        return rng.randint(0, 9)
+    if kind == 5:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {f"k{i}": _random_value(rng, depth + 1) for i in range(rng.randrange(4))}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64])
+def test_iter_json_array_matches_json_load(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(scheduler_utils, "JSON_STREAM_CHUNK", chunk_size)
+    rng = random.Random(chunk_size)
+    path = tmp_path / "items.json"
+    for indent in (None, 2):
+        for _ in range(50):
+            items = [_random_value(rng) for _ in range(rng.randrange(8))]
+            path.write_text("\n " + json.dumps(items, ensure_ascii=False, indent=indent) + "\n", encoding="utf-8")
+            assert list(scheduler_utils._iter_json_array(path)) == items
+
+
+@pytest.mark.parametrize("text", ["{}", '"x"', "[1, 2", "[1 2]", "[1,]", "[1,,2]", "[150.]", ""])
+def test_iter_json_array_rejects_invalid(tmp_path, monkeypatch, text):
+    monkeypatch.setattr(scheduler_utils, "JSON_STREAM_CHUNK", 4)
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(scheduler_utils._iter_json_array(path))
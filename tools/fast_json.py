@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+メモリファイル用のJSON読み書きヘルパー
+
+orjson がインストールされていれば使い（標準の json より数倍速い）、
+なければ標準の json にフォールバックする。
+
+出力は json.dump(obj, f, ensure_ascii=False, indent=2) と同じ形式
+（orjson では浮動小数点の指数表記のみ 1e16 のように短くなる）。
+orjson が扱えないデータ（64bitを超える整数、NaN、孤立サロゲートなど）は
+標準の json で処理する。
+
+書き込みは一時ファイル + os.replace で行うので、途中で落ちても
+壊れたファイル（書きかけのJSON）が残らない。
+読み込み〜書き込みの間は locked() で他プロセスと排他できる。
+"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: str | bytes) -> Any:
+    """JSON文字列（またはバイト列）をパース"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # 標準の json は NaN などを受け付けるので再試行
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """indent=2・ensure_ascii=False 形式の UTF-8 バイト列に変換"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def load_file(path: Path) -> Any:
+    """JSONファイルを読み込む"""
+    return loads(Path(path).read_bytes())
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """同じディレクトリの一時ファイルに書いてから os.replace で置き換える（fsyncはしない）"""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def dump_file(path: Path, obj: Any):
+    """JSONファイルに保存"""
+    atomic_write_bytes(path, dumps_bytes(obj))
+
+
+@contextmanager
+def locked(path: Path):
+    """path の読み込み〜書き込み（read-modify-write）を他プロセスと排他する
+
+    書き込みは os.replace でファイルごと置き換わるので、flock は対象ファイル
+    ではなく隣の .{name}.lock にかける。ロックはブロック中ずっと保持される。
+    """
+    path = Path(path)
+    with open(path.with_name(f".{path.name}.lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
@@ -16,6 +16,8 @@ import json
 from pathlib import Path
 from dotenv import load_dotenv
 
+import fast_json
+
 # .env読み込み
 load_dotenv()
 
@@ -363,7 +365,10 @@ def add_reverse_links(source_id: str, related_memories: list[dict]) -> dict:
 
         # diary.jsonの場合
         elif ":datetime:" in target_id:
-            if _add_reverse_link_to_diary(target_id, source_id, reverse_reason):
+            # update_diary.py と同じロックで読み込み〜書き込みを排他
+            with fast_json.locked(REPO_ROOT / "memory" / "diary.json"):
+                updated = _add_reverse_link_to_diary(target_id, source_id, reverse_reason)
+            if updated:
                 result["updated_diary"].append(target_id)
 
         # experiences.jsonlの場合
@@ -378,7 +383,10 @@ def add_reverse_links(source_id: str, related_memories: list[dict]) -> dict:
 
         # goals.jsonの場合
         elif "goals.json:" in target_id:
-            if _add_reverse_link_to_goals(target_id, source_id, reverse_reason):
+            # update_goals.py と同じロックで読み込み〜書き込みを排他
+            with fast_json.locked(REPO_ROOT / "memory" / "goals.json"):
+                updated = _add_reverse_link_to_goals(target_id, source_id, reverse_reason)
+            if updated:
                 result["updated_goals"].append(target_id)
 
         # articles.jsonの場合
@@ -446,12 +454,12 @@ def _add_reverse_link_to_diary(target_id: str, source_id: str, reason: str) -> b
             related = entry.get("related_memories", [])
 
             # 既存のIDを抽出（文字列/オブジェクト両対応）
-            existing_ids = []
+            existing_ids = set()
             for r in related:
                 if isinstance(r, dict):
-                    existing_ids.append(r.get("id", ""))
+                    existing_ids.add(r.get("id", ""))
                 else:
-                    existing_ids.append(r)
+                    existing_ids.add(r)
 
             # 既に同じリンクがあればスキップ
             if source_id in existing_ids:
@@ -571,12 +579,12 @@ def _add_reverse_link_to_experiences(target_id: str, source_id: str, reason: str
             related = entry.get("related_memories", [])
 
             # 既存のIDを抽出（文字列/オブジェクト両対応）
-            existing_ids = []
+            existing_ids = set()
             for r in related:
                 if isinstance(r, dict):
-                    existing_ids.append(r.get("id", ""))
+                    existing_ids.add(r.get("id", ""))
                 else:
-                    existing_ids.append(r)
+                    existing_ids.add(r)
 
             # 既に同じリンクがあればスキップ
             if source_id in existing_ids:
@@ -618,12 +626,12 @@ def _add_reverse_link_to_creations(target_id: str, source_id: str, reason: str)
             related = entry.get("related_memories", [])
 
             # 既存のIDを抽出（文字列/オブジェクト両対応）
-            existing_ids = []
+            existing_ids = set()
             for r in related:
                 if isinstance(r, dict):
-                    existing_ids.append(r.get("id", ""))
+                    existing_ids.add(r.get("id", ""))
                 else:
-                    existing_ids.append(r)
+                    existing_ids.add(r)
 
             # 既に同じリンクがあればスキップ
             if source_id in existing_ids:
@@ -666,12 +674,12 @@ def _add_reverse_link_to_goals(target_id: str, source_id: str, reason: str) -> b
             related = entry.get("related_memories", [])
 
             # 既存のIDを抽出（文字列/オブジェクト両対応）
-            existing_ids = []
+            existing_ids = set()
             for r in related:
                 if isinstance(r, dict):
-                    existing_ids.append(r.get("id", ""))
+                    existing_ids.add(r.get("id", ""))
                 else:
-                    existing_ids.append(r)
+                    existing_ids.add(r)
 
             # 既に同じリンクがあればスキップ
             if source_id in existing_ids:
@@ -713,12 +721,12 @@ def _add_reverse_link_to_articles(target_id: str, source_id: str, reason: str) -
             related = entry.get("related_memories", [])
 
             # 文字列形式の場合もあるので、dictに変換して確認
-            existing_ids = []
+            existing_ids = set()
             for r in related:
                 if isinstance(r, dict):
-                    existing_ids.append(r.get("id", ""))
+                    existing_ids.add(r.get("id", ""))
                 else:
-                    existing_ids.append(r)
+                    existing_ids.add(r)
 
             # 既に同じリンクがあればスキップ
             if source_id in existing_ids:
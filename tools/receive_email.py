@@ -29,10 +29,14 @@ import os
 import sys
 import base64
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.http import build_http
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -52,13 +56,31 @@ CREDENTIALS_DIR = PROJECT_ROOT / "secrets"
 CREDENTIALS_FILE = CREDENTIALS_DIR / "credentials.json"
 TOKEN_FILE = CREDENTIALS_DIR / "token.json"
 
+# プロセス内で使い回すサービスと認証情報（Gatewayからimportした場合など）
+_service_cache = None
+_creds_cache = None
+
+
+def _save_token(creds):
+    """Token を保存（内容が変わっていない場合は書き込まない）"""
+    token_json = creds.to_json()
+    if TOKEN_FILE.exists() and TOKEN_FILE.read_text() == token_json:
+        return
+    with open(TOKEN_FILE, "w") as token:
+        token.write(token_json)
+
 
 def get_service():
-    """Gmail APIサービスを取得"""
-    creds = None
+    """Gmail APIサービスを取得（認証情報が有効な間はキャッシュを再利用）"""
+    global _service_cache, _creds_cache
+
+    if _service_cache is not None and _creds_cache.valid:
+        return _service_cache
+
+    creds = _creds_cache
 
     # Token ファイルが存在する場合は読み込み
-    if TOKEN_FILE.exists():
+    if creds is None and TOKEN_FILE.exists():
         creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
 
     # 認証が必要な場合
@@ -78,10 +100,12 @@ def get_service():
             creds = flow.run_local_server(port=0)
 
         # Token を保存
-        with open(TOKEN_FILE, "w") as token:
-            token.write(creds.to_json())
+        _save_token(creds)
 
-    return build("gmail", "v1", credentials=creds)
+    # static_discovery: ライブラリ同梱のdiscovery docを使う（HTTP取得しない）
+    _service_cache = build("gmail", "v1", credentials=creds, static_discovery=True, cache_discovery=False)
+    _creds_cache = creds
+    return _service_cache
 
 
 def list_messages(service, query="", max_results=10):
@@ -95,16 +119,99 @@ def list_messages(service, query="", max_results=10):
         return []
 
 
-def get_message(service, msg_id):
-    """メールの詳細を取得"""
+# 本文不要時に取得するヘッダー
+METADATA_HEADERS = ["Subject", "From", "To", "Date"]
+
+# 1回のバッチリクエストに含める最大件数（Gmail APIの上限は100）
+BATCH_SIZE = 100
+
+# バッチが使えない場合に並列実行するスレッド数
+PARALLEL_WORKERS = 8
+
+
+def _get_request(service, msg_id, body_needed):
+    """messages.get リクエストを作成（未実行）"""
+    if body_needed:
+        return service.users().messages().get(userId="me", id=msg_id, format="full")
+    return service.users().messages().get(
+        userId="me", id=msg_id, format="metadata", metadataHeaders=METADATA_HEADERS
+    )
+
+
+def get_message(service, msg_id, body_needed=True):
+    """メールの詳細を取得
+
+    body_needed=False の場合は format="metadata" でヘッダーのみ取得する
+    （本文・添付のペイロードをダウンロードしない）
+    """
     try:
-        message = service.users().messages().get(userId="me", id=msg_id, format="full").execute()
-        return message
+        return _get_request(service, msg_id, body_needed).execute()
     except Exception as e:
         print(f"エラー: メール詳細の取得に失敗しました: {e}", file=sys.stderr)
         return None
 
 
+def _execute_parallel(requests):
+    """(request_id, request) のリストをスレッドで並列実行し、成功した {request_id: response} を返す
+
+    バッチリクエスト自体が失敗した場合のフォールバック。
+    httplib2.Http はスレッドセーフではないため、スレッドごとに Http を作る。
+    build_http() はライブラリ既定のソケットタイムアウトを設定するので、
+    応答のないリクエストでワーカー（Gatewayのポーリングスレッド）が止まらない。
+    """
+    local = threading.local()
+
+    def run(item):
+        request_id, request = item
+        if not hasattr(local, "http"):
+            local.http = AuthorizedHttp(request.http.credentials, http=build_http())
+        try:
+            return request_id, request.execute(http=local.http)
+        except Exception as e:
+            print(f"エラー: リクエストに失敗しました ({request_id}): {e}", file=sys.stderr)
+            return request_id, None
+
+    with ThreadPoolExecutor(max_workers=PARALLEL_WORKERS) as executor:
+        results = list(executor.map(run, requests))
+    return {request_id: response for request_id, response in results if response is not None}
+
+
+def _execute_batch(service, requests):
+    """(request_id, request) のリストをバッチ実行し、成功した {request_id: response} を返す
+
+    バッチリクエストが使えない場合はスレッドでの並列実行にフォールバックする
+    """
+    responses = {}
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            print(f"エラー: バッチリクエストに失敗しました ({request_id}): {exception}", file=sys.stderr)
+        else:
+            responses[request_id] = response
+
+    for i in range(0, len(requests), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=collect)
+        for request_id, request in requests[i:i + BATCH_SIZE]:
+            batch.add(request, request_id=request_id)
+        try:
+            batch.execute()
+        except Exception as e:
+            print(f"⚠️ バッチリクエストに失敗したため並列で再実行します: {e}", file=sys.stderr)
+            responses.update(_execute_parallel(requests[i:i + BATCH_SIZE]))
+    return responses
+
+
+def get_messages(service, msg_ids, body_needed=True):
+    """複数メールの詳細を1回のHTTPリクエスト（バッチ）で取得
+
+    Returns:
+        dict: {msg_id: message}（取得に失敗したメールは含まない）
+    """
+    return _execute_batch(
+        service, [(msg_id, _get_request(service, msg_id, body_needed)) for msg_id in msg_ids]
+    )
+
+
 def mark_as_read(service, msg_id):
     """メールを既読にする（UNREADラベルを削除）"""
     try:
@@ -119,6 +226,21 @@ def mark_as_read(service, msg_id):
         return False
 
 
+def mark_as_read_batch(service, msg_ids):
+    """複数メールを1回のHTTPリクエスト（バッチ）で既読にする
+
+    Returns:
+        list: 既読にできたメールID
+    """
+    responses = _execute_batch(service, [
+        (msg_id, service.users().messages().modify(
+            userId="me", id=msg_id, body={"removeLabelIds": ["UNREAD"]}
+        ))
+        for msg_id in msg_ids
+    ])
+    return [msg_id for msg_id in msg_ids if msg_id in responses]
+
+
 def get_header(headers, name):
     """ヘッダーから特定のフィールドを取得"""
     for header in headers:
@@ -127,23 +249,38 @@ def get_header(headers, name):
     return ""
 
 
+def header_dict(message):
+    """ヘッダーを {小文字のヘッダー名: 値} の辞書に変換（複数フィールドを引く場合は1回の走査で済む）
+
+    同名ヘッダーが複数ある場合は get_header と同じく最初の値を使う
+    """
+    hdr = {}
+    for header in message["payload"]["headers"]:
+        hdr.setdefault(header["name"].lower(), header["value"])
+    return hdr
+
+
 def decode_body(payload):
-    """メール本文をデコード"""
-    body = ""
+    """メール本文をデコード
+
+    本文データ（text/plain）を見つけてから1回だけデコードする。
+    format="metadata" で取得したペイロード（本文なし）は空文字を返す。
+    """
+    data = None
 
     if "parts" in payload:
-        # マルチパート
+        # マルチパート（最初の text/plain のみ）
         for part in payload["parts"]:
-            if part["mimeType"] == "text/plain":
-                if "data" in part["body"]:
-                    body = base64.urlsafe_b64decode(part["body"]["data"]).decode("utf-8", errors="replace")
-                    break
+            if part.get("mimeType") == "text/plain" and "data" in part.get("body", {}):
+                data = part["body"]["data"]
+                break
     else:
         # シングルパート
-        if "data" in payload["body"]:
-            body = base64.urlsafe_b64decode(payload["body"]["data"]).decode("utf-8", errors="replace")
+        data = payload.get("body", {}).get("data")
 
-    return body
+    if not data:
+        return ""
+    return base64.urlsafe_b64decode(data).decode("utf-8", errors="replace")
 
 
 def get_attachments(payload):
@@ -192,16 +329,30 @@ def format_timestamp(internal_date):
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
-def display_message(service, msg_id, show_body=True):
-    """メールを表示"""
-    message = get_message(service, msg_id)
+def message_to_dict(message, include_body=True):
+    """メールを辞書に変換（--json出力・Gatewayからのimport用）"""
+    hdr = header_dict(message)
+    return {
+        "id": message["id"],
+        "from": hdr.get("from", ""),
+        "to": hdr.get("to", ""),
+        "subject": hdr.get("subject", ""),
+        "date": format_timestamp(message["internalDate"]),
+        "body": decode_body(message["payload"]) if include_body else "",
+    }
+
+
+def display_message(service, msg_id, show_body=True, message=None):
+    """メールを表示（message が取得済みならそれを使う）"""
+    if message is None:
+        message = get_message(service, msg_id, body_needed=show_body)
     if not message:
         return
 
-    headers = message["payload"]["headers"]
-    from_addr = get_header(headers, "From")
-    to_addr = get_header(headers, "To")
-    subject = get_header(headers, "Subject")
+    hdr = header_dict(message)
+    from_addr = hdr.get("from", "")
+    to_addr = hdr.get("to", "")
+    subject = hdr.get("subject", "")
     date = format_timestamp(message["internalDate"])
 
     print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -233,7 +384,7 @@ def main():
     parser.add_argument("--unread", action="store_true", help="未読メールのみ表示")
     parser.add_argument("--from", dest="from_addr", help="特定の送信者からのメール")
     parser.add_argument("--subject", help="件名で検索")
-    parser.add_argument("--no-body", action="store_true", help="本文を表示しない（件名のみ）")
+    parser.add_argument("--no-body", action="store_true", help="本文を表示しない（件名のみ、添付ファイル情報も省略）")
     parser.add_argument("--do-not-mark-read", action="store_true", help="既読にしない（デフォルトでは既読にする）")
     parser.add_argument("--reauth", action="store_true", help="トークンを削除して再認証する")
     parser.add_argument("--json", action="store_true", help="JSON形式で出力（id, from, subject, body を含む）")
@@ -276,26 +427,16 @@ def main():
             print("メールが見つかりませんでした。")
         return
 
+    # メール詳細をバッチで取得
+    fetched = get_messages(service, [msg["id"] for msg in messages], body_needed=not args.no_body)
+    fetched_ids = [msg["id"] for msg in messages if msg["id"] in fetched]
+
     # JSON出力モード
     if args.json:
         import json as json_mod
-        results = []
-        for msg in messages:
-            message = get_message(service, msg["id"])
-            if not message:
-                continue
-            headers = message["payload"]["headers"]
-            body = decode_body(message["payload"]) if not args.no_body else ""
-            results.append({
-                "id": msg["id"],
-                "from": get_header(headers, "From"),
-                "to": get_header(headers, "To"),
-                "subject": get_header(headers, "Subject"),
-                "date": format_timestamp(message["internalDate"]),
-                "body": body,
-            })
-            if not args.do_not_mark_read:
-                mark_as_read(service, msg["id"])
+        results = [message_to_dict(fetched[msg_id], include_body=not args.no_body) for msg_id in fetched_ids]
+        if not args.do_not_mark_read:
+            mark_as_read_batch(service, fetched_ids)
         print(json_mod.dumps(results, ensure_ascii=False))
         return
 
@@ -303,14 +444,14 @@ def main():
     print()
 
     # メールを表示
-    for msg in messages:
-        display_message(service, msg["id"], show_body=not args.no_body)
+    for msg_id in fetched_ids:
+        display_message(service, msg_id, show_body=not args.no_body, message=fetched[msg_id])
 
-        # デフォルトで既読にする（--do-not-mark-readが指定されていない場合）
-        if not args.do_not_mark_read:
-            if mark_as_read(service, msg["id"]):
-                print("  ✓ 既読にしました")
-            print()
+    # デフォルトで既読にする（--do-not-mark-readが指定されていない場合）
+    if not args.do_not_mark_read and fetched_ids:
+        marked = mark_as_read_batch(service, fetched_ids)
+        print(f"  ✓ {len(marked)}件を既読にしました")
+        print()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = []
+# dependencies = ["orjson"]
 # ///
 """
 Memory Search Tool - 記憶検索ツール
@@ -15,10 +15,23 @@ Usage:
 
 import json
 import argparse
+import heapq
+import io
+import mmap
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Pattern, TextIO, Tuple
+
+import fast_json
+
+# A search hit: (sort_key, source, raw record). Display fields are only
+# pulled out of the record for the hits that are actually printed.
+Hit = Tuple[str, str, Any]
 
 # ANSI color codes
 RESET = "\033[0m"
@@ -31,102 +44,259 @@ CYAN = "\033[36m"
 RED = "\033[31m"
 
 
-def highlight_text(text: str, query: str, ignore_case: bool = True) -> str:
-    """Highlight query matches in text"""
+def compile_query(query: str, ignore_case: bool = True) -> Optional[Pattern]:
+    """Compile the (literal) query once for highlighting"""
     if not query:
-        return text
+        return None
 
     flags = re.IGNORECASE if ignore_case else 0
-    pattern = re.escape(query)
-    return re.sub(f'({pattern})', f'{YELLOW}\\1{RESET}', text, flags=flags)
+    return re.compile(re.escape(query), flags)
+
+
+def highlight_text(text: str, pattern: Optional[Pattern]) -> str:
+    """Highlight query matches in text"""
+    if pattern is None:
+        return text
+
+    # Join the spans from finditer() instead of sub() with a template
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        parts.extend((text[last:start], YELLOW, text[start:end], RESET))
+        last = end
+    if not parts:
+        return text
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def make_needle(query: str, ignore_case: bool = True) -> Optional[str]:
+    """
+    The query as a plain substring (lowercased for case-insensitive search)
+    for the fast paths of contains() and the raw-line prefilter
+    """
+    if not query:
+        return None
+    return query.lower() if ignore_case else query
+
+
+def ignore_case_pattern(query: str, ignore_case: bool = True) -> Optional[Pattern]:
+    """
+    The compiled query, when contains() needs the regex to match it.
+
+    A plain substring test (`needle in text`) gives the same result as
+    the regex for case-sensitive search and for a query without cased
+    characters (e.g. Japanese), so None is returned for those. Otherwise
+    re.IGNORECASE is not the same as comparing str.lower() (e.g. U+0130
+    lowercases to 'i' + U+0307 but matches 'i', and U+017F matches 's').
+    """
+    needle = make_needle(query, ignore_case)
+    if not ignore_case or needle is None or needle == needle.upper():
+        return None
+    return compile_query(query, ignore_case)
+
+
+def contains(text: str, needle: str, pattern: Optional[Pattern]) -> bool:
+    """
+    Whether the query matches text, given make_needle() and
+    ignore_case_pattern() of it. ASCII-only text and needles are still
+    matched without the regex.
+    """
+    if pattern is None:
+        return needle in text
+    if needle.isascii() and text.isascii():
+        return needle in text.lower()
+    return pattern.search(text) is not None
+
+
+def contains_fields(fields, needle: str, pattern: Optional[Pattern]) -> bool:
+    """
+    Same as contains(' '.join(fields), ...), but each field is tested on
+    its own. The joined text is only built when the needle contains a
+    space, i.e. could span the separator between fields.
+    """
+    fields = [str(f) for f in fields]
+    if any(contains(f, needle, pattern) for f in fields):
+        return True
+    return ' ' in needle and contains(' '.join(fields), needle, pattern)
+
+
+# JSON syntax and separators can be formatted differently in a raw line
+# than in the re-serialized searchable text
+_JSON_SYNTAX_CHARS = frozenset('{}[],:"\\')
+
+
+# Characters a match can start with inside a \uXXXX escape that json.dumps()
+# writes for non-ASCII metadata
+_ESCAPE_START_CHARS = frozenset('u0123456789abcdef')
+# ASCII letters that re.IGNORECASE also matches with non-ASCII characters
+# (U+0130 and U+0131 -> 'i', KELVIN SIGN -> 'k', U+017F -> 's'), which
+# bytes.lower() misses
+_UNICODE_CASE_TO_ASCII = frozenset('iks')
+
+
+def can_prefilter_raw(needle: str) -> bool:
+    """
+    Whether a raw JSON line without the needle can be skipped unparsed.
+
+    True when the needle cannot depend on JSON formatting: it contains no
+    JSON syntax characters and no leading/trailing whitespace (which could
+    match the separator between description and metadata).
+    """
+    return needle == needle.strip() and not (_JSON_SYNTAX_CHARS & set(needle))
+
+
+def can_prefilter_non_ascii(needle: str, ignore_case: bool = True) -> bool:
+    """
+    Whether the byte-level check of an ASCII needle (bytes.lower(), which
+    folds ASCII only) is also valid for raw lines with non-ASCII text.
+
+    The needle must not be able to start inside a \\uXXXX escape of the
+    json.dumps()'d metadata, and for case-insensitive search must not
+    contain a letter that re.IGNORECASE matches with a non-ASCII character.
+    """
+    if needle[0] in _ESCAPE_START_CHARS:
+        return False
+    return not (ignore_case and _UNICODE_CASE_TO_ASCII & set(needle))
+
+
+def iter_jsonl_lines(path: Path):
+    """
+    Yield the non-empty raw lines (bytes) of a JSONL file.
+
+    The file is memory-mapped and split with bytes.find(b'\\n'), so lines
+    are not decoded or copied through the text I/O layer until a caller
+    actually needs them.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            start = 0
+            while start < size:
+                end = mm.find(b'\n', start)
+                if end == -1:
+                    end = size
+                line = mm[start:end]
+                start = end + 1
+                if line.strip():
+                    yield line
+
+
+def metadata_json(exp: Dict[str, Any]) -> str:
+    """The metadata part of an experience's searchable text"""
+    metadata = exp.get('metadata', {})
+    return '{}' if metadata == {} else json.dumps(metadata)
+
+
+def experience_matches(exp: Dict[str, Any], needle: str, pattern: Optional[Pattern]) -> bool:
+    """
+    contains_fields() over the description and metadata, but the metadata
+    is only serialized when the description alone doesn't match
+    """
+    description = exp.get('description', '')
+    if contains(str(description), needle, pattern):
+        return True
+    return contains_fields((description, metadata_json(exp)), needle, pattern)
 
 
 def search_experiences(query: str, from_date: str = None, to_date: str = None,
-                      exp_type: str = None, ignore_case: bool = True) -> List[Dict[str, Any]]:
+                      exp_type: str = None, ignore_case: bool = True) -> List[Hit]:
     """Search experiences.jsonl"""
     experiences_file = Path(__file__).parent.parent / "memory" / "experiences.jsonl"
 
     if not experiences_file.exists():
         return []
 
+    needle = make_needle(query, ignore_case)
+    pattern = ignore_case_pattern(query, ignore_case)
+    prefilter = needle is not None and can_prefilter_raw(needle)
+    needle_ascii = prefilter and needle.isascii()
+    needle_bytes = needle.encode('utf-8') if needle_ascii else None
+    any_line = needle_ascii and can_prefilter_non_ascii(needle, ignore_case)
+    # A non-ASCII needle can still match the ASCII text of a \uXXXX escape
+    # in the metadata (U+017F matches 's', ...), so it must not start in one
+    text_prefilter = prefilter and not needle_ascii and needle[0] not in _ESCAPE_START_CHARS
+    type_bytes = exp_type.encode('utf-8') if exp_type else None
+
     results = []
-    with open(experiences_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            if not line.strip():
+    for line in iter_jsonl_lines(experiences_file):
+        # Reject on the raw line before json.loads(). Only for lines
+        # without escapes, where every string value appears verbatim.
+        # An ASCII needle is matched on the bytes (UTF-8 multibyte
+        # sequences are left alone by bytes.lower()); lines with non-ASCII
+        # text only when can_prefilter_non_ascii() allows it.
+        if b'\\' not in line:
+            if type_bytes and type_bytes not in line:
                 continue
-
-            exp = json.loads(line)
-
-            # Date filter
-            if from_date or to_date:
-                exp_date = exp.get('timestamp', '').split('T')[0]
-                if from_date and exp_date < from_date:
-                    continue
-                if to_date and exp_date > to_date:
+            if needle_ascii:
+                if (any_line or line.isascii()) and needle_bytes not in (line.lower() if ignore_case else line):
                     continue
+            elif text_prefilter and not contains(line.decode('utf-8'), needle, pattern):
+                continue
 
-            # Type filter
-            if exp_type and exp.get('type') != exp_type:
+        exp = fast_json.loads(line)
+
+        # Date filter. YYYY-MM-DD is fixed-width, so comparing the strings
+        # orders the dates (a single memcmp; converting both sides to int
+        # per record would cost more than it saves)
+        if from_date or to_date:
+            exp_date = exp.get('timestamp', '').partition('T')[0]
+            if from_date and exp_date < from_date:
+                continue
+            if to_date and exp_date > to_date:
                 continue
 
-            # Query filter
-            if query:
-                searchable = f"{exp.get('description', '')} {json.dumps(exp.get('metadata', {}))}"
-                flags = re.IGNORECASE if ignore_case else 0
-                if not re.search(re.escape(query), searchable, flags):
-                    continue
+        # Type filter
+        if exp_type and exp.get('type') != exp_type:
+            continue
+
+        # Query filter
+        if needle and not experience_matches(exp, needle, pattern):
+            continue
 
-            results.append({
-                'source': 'experiences',
-                'timestamp': exp.get('timestamp', ''),
-                'type': exp.get('type', ''),
-                'description': exp.get('description', ''),
-                'metadata': exp.get('metadata', {}),
-                'raw': exp
-            })
+        results.append((exp.get('timestamp', ''), 'experiences', exp))
 
     return results
 
 
-def search_knowledge(query: str, ignore_case: bool = True) -> List[Dict[str, Any]]:
+def search_knowledge(query: str, ignore_case: bool = True) -> List[Hit]:
     """Search knowledge.json"""
     knowledge_file = Path(__file__).parent.parent / "memory" / "knowledge.json"
 
     if not knowledge_file.exists():
         return []
 
-    with open(knowledge_file, 'r', encoding='utf-8') as f:
-        knowledge = json.load(f)
+    knowledge = fast_json.load_file(knowledge_file)
 
+    needle = make_needle(query, ignore_case)
+    pattern = ignore_case_pattern(query, ignore_case)
     results = []
     facts = knowledge.get('facts', [])
 
     for fact in facts:
-        if query:
-            flags = re.IGNORECASE if ignore_case else 0
-            if not re.search(re.escape(query), fact, flags):
-                continue
+        if needle and not contains(fact, needle, pattern):
+            continue
 
-        results.append({
-            'source': 'knowledge',
-            'fact': fact,
-            'raw': fact
-        })
+        results.append(('', 'knowledge', fact))  # knowledge has no date
 
     return results
 
 
 def search_diary(query: str, from_date: str = None, to_date: str = None,
-                ignore_case: bool = True) -> List[Dict[str, Any]]:
+                ignore_case: bool = True) -> List[Hit]:
     """Search diary.json"""
     diary_file = Path(__file__).parent.parent / "memory" / "diary.json"
 
     if not diary_file.exists():
         return []
 
-    with open(diary_file, 'r', encoding='utf-8') as f:
-        diary = json.load(f)
+    diary = fast_json.load_file(diary_file)
 
+    needle = make_needle(query, ignore_case)
+    pattern = ignore_case_pattern(query, ignore_case)
     results = []
 
     for entry in diary:
@@ -139,51 +309,45 @@ def search_diary(query: str, from_date: str = None, to_date: str = None,
             continue
 
         # Query filter
-        if query:
-            searchable = f"{entry.get('title', '')} {entry.get('content', '')}"
-            flags = re.IGNORECASE if ignore_case else 0
-            if not re.search(re.escape(query), searchable, flags):
+        if needle:
+            fields = (entry.get('title', ''), entry.get('content', ''))
+            if not contains_fields(fields, needle, pattern):
                 continue
 
-        results.append({
-            'source': 'diary',
-            'date': entry_date,
-            'title': entry.get('title', ''),
-            'time_period': entry.get('time_period', ''),
-            'content': entry.get('content', ''),
-            'raw': entry
-        })
+        results.append((entry_date, 'diary', entry))
 
     return results
 
 
-def print_result(result: Dict[str, Any], query: str, ignore_case: bool):
-    """Print a single search result"""
-    source = result['source']
+def print_result(hit: Hit, pattern: Optional[Pattern], out: TextIO):
+    """Print a single search result to out"""
+    sort_key, source, raw = hit
 
     if source == 'experiences':
-        timestamp = result['timestamp'].split('T')
+        timestamp = sort_key.split('T')
         date = timestamp[0] if timestamp else ''
         time = timestamp[1].split('.')[0] if len(timestamp) > 1 else ''
+        metadata = raw.get('metadata', {})
 
-        print(f"{CYAN}[experiences]{RESET} {GREEN}{date} {time}{RESET} {MAGENTA}({result['type']}){RESET}")
-        print(f"  {highlight_text(result['description'], query, ignore_case)}")
-        if result['metadata']:
-            print(f"  {BLUE}metadata:{RESET} {json.dumps(result['metadata'], ensure_ascii=False)}")
-        print()
+        print(f"{CYAN}[experiences]{RESET} {GREEN}{date} {time}{RESET} {MAGENTA}({raw.get('type', '')}){RESET}", file=out)
+        print(f"  {highlight_text(raw.get('description', ''), pattern)}", file=out)
+        if metadata:
+            print(f"  {BLUE}metadata:{RESET} {json.dumps(metadata, ensure_ascii=False)}", file=out)
+        print(file=out)
 
     elif source == 'knowledge':
-        print(f"{CYAN}[knowledge]{RESET}")
-        print(f"  {highlight_text(result['fact'], query, ignore_case)}")
-        print()
+        print(f"{CYAN}[knowledge]{RESET}", file=out)
+        print(f"  {highlight_text(raw, pattern)}", file=out)
+        print(file=out)
 
     elif source == 'diary':
-        print(f"{CYAN}[diary]{RESET} {GREEN}{result['date']}{RESET} {result['time_period']}")
-        print(f"  {BOLD}{highlight_text(result['title'], query, ignore_case)}{RESET}")
+        content = raw.get('content', '')
+        print(f"{CYAN}[diary]{RESET} {GREEN}{sort_key}{RESET} {raw.get('time_period', '')}", file=out)
+        print(f"  {BOLD}{highlight_text(raw.get('title', ''), pattern)}{RESET}", file=out)
         # Print first 200 chars of content
-        content_preview = result['content'][:200] + '...' if len(result['content']) > 200 else result['content']
-        print(f"  {highlight_text(content_preview, query, ignore_case)}")
-        print()
+        content_preview = content[:200] + '...' if len(content) > 200 else content
+        print(f"  {highlight_text(content_preview, pattern)}", file=out)
+        print(file=out)
 
 
 def main():
@@ -218,50 +382,53 @@ Examples:
 
     args = parser.parse_args()
 
-    # Collect results
-    all_results = []
+    # Collect results (the sources are independent, so read/parse them
+    # concurrently; results are concatenated in the same order as before)
+    jobs = []
 
     if args.source in ['all', 'experiences']:
-        all_results.extend(search_experiences(
+        jobs.append((search_experiences, (
             args.query, args.from_date, args.to_date, args.type, args.ignore_case
-        ))
+        )))
 
     if args.source in ['all', 'knowledge']:
-        all_results.extend(search_knowledge(args.query, args.ignore_case))
+        jobs.append((search_knowledge, (args.query, args.ignore_case)))
 
     if args.source in ['all', 'diary']:
-        all_results.extend(search_diary(
+        jobs.append((search_diary, (
             args.query, args.from_date, args.to_date, args.ignore_case
-        ))
-
-    # Sort by timestamp/date
-    def get_sort_key(r):
-        if r['source'] == 'experiences':
-            return r.get('timestamp', '')
-        elif r['source'] == 'diary':
-            return r.get('date', '')
-        else:
-            return ''  # knowledge has no date
-
-    all_results.sort(key=get_sort_key)
-
-    # Apply limit
-    results = all_results[:args.limit] if args.limit else all_results
-
-    # Print results
-    print(f"{BOLD}Search Results:{RESET}")
-    print(f"Query: {YELLOW}{args.query or '(none)'}{RESET}")
-    print(f"Source: {args.source}, From: {args.from_date or 'beginning'}, To: {args.to_date or 'now'}")
-    print(f"Found {len(all_results)} results (showing {len(results)})")
-    print(f"{'-' * 70}\n")
-
+        )))
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [executor.submit(fn, *fn_args) for fn, fn_args in jobs]
+        all_results = [hit for future in futures for hit in future.result()]
+
+    # Pick the first --limit results by timestamp/date. nsmallest() is
+    # stable (same as sorted()[:limit]) without sorting every hit.
+    if args.limit and args.limit > 0:
+        results = heapq.nsmallest(args.limit, all_results, key=itemgetter(0))
+    else:
+        all_results.sort(key=itemgetter(0))
+        results = all_results[:args.limit] if args.limit else all_results
+
+    # Print results (buffered and written to stdout in one go)
+    out = io.StringIO()
+    print(f"{BOLD}Search Results:{RESET}", file=out)
+    print(f"Query: {YELLOW}{args.query or '(none)'}{RESET}", file=out)
+    print(f"Source: {args.source}, From: {args.from_date or 'beginning'}, To: {args.to_date or 'now'}", file=out)
+    print(f"Found {len(all_results)} results (showing {len(results)})", file=out)
+    print(f"{'-' * 70}\n", file=out)
+
+    # Compile the query once for highlighting
+    pattern = compile_query(args.query, args.ignore_case)
     for result in results:
-        print_result(result, args.query or '', args.ignore_case)
+        print_result(result, pattern, out)
 
     # Summary
-    sources_found = set(r['source'] for r in all_results)
-    print(f"{'-' * 70}")
-    print(f"{BOLD}Summary:{RESET} {len(all_results)} results from {len(sources_found)} source(s): {', '.join(sources_found)}")
+    sources_found = set(source for _, source, _ in all_results)
+    print(f"{'-' * 70}", file=out)
+    print(f"{BOLD}Summary:{RESET} {len(all_results)} results from {len(sources_found)} source(s): {', '.join(sources_found)}", file=out)
+    sys.stdout.write(out.getvalue())
 
 
 if __name__ == '__main__':
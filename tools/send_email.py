@@ -24,6 +24,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
+from email.header import Header
 
 from googleapiclient.discovery import build
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -43,13 +44,25 @@ CREDENTIALS_DIR = PROJECT_ROOT / "secrets"
 CREDENTIALS_FILE = CREDENTIALS_DIR / "credentials.json"
 TOKEN_FILE = CREDENTIALS_DIR / "token.json"
 
+# RFC 5322 の1行の上限（CRLFを除く）。これを超える本文は8bitで送れない
+MAX_LINE_BYTES = 998
+
+# プロセス内で使い回すサービスと認証情報（複数通をループで送る場合など）
+_service_cache = None
+_creds_cache = None
+
 
 def get_service():
-    """Gmail APIサービスを取得"""
-    creds = None
+    """Gmail APIサービスを取得（認証情報が有効な間はキャッシュを再利用）"""
+    global _service_cache, _creds_cache
+
+    if _service_cache is not None and _creds_cache.valid:
+        return _service_cache
+
+    creds = _creds_cache
 
     # Token ファイルが存在する場合は読み込み
-    if TOKEN_FILE.exists():
+    if creds is None and TOKEN_FILE.exists():
         creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
 
     # 認証が必要な場合
@@ -71,7 +84,10 @@ def get_service():
         with open(TOKEN_FILE, "w") as token:
             token.write(creds.to_json())
 
-    return build("gmail", "v1", credentials=creds)
+    # static_discovery: ライブラリ同梱のdiscovery docを使う（HTTP取得しない）
+    _service_cache = build("gmail", "v1", credentials=creds, static_discovery=True, cache_discovery=False)
+    _creds_cache = creds
+    return _service_cache
 
 
 def create_message(to, subject, body, from_email=FROM_EMAIL, attachments=None):
@@ -108,8 +124,12 @@ def create_message(to, subject, body, from_email=FROM_EMAIL, attachments=None):
                 filename = Path(attachment_path).name
                 attachment.add_header("Content-Disposition", "attachment", filename=filename)
                 message.attach(attachment)
+    elif to.isascii() and from_email.isascii():
+        # 添付ファイルがない場合はMIMETextを使わずに直接組み立てる
+        payload = _build_plain_message(to, subject, body, from_email)
+        return {"raw": base64.urlsafe_b64encode(payload).decode("ascii")}
     else:
-        # 添付ファイルがない場合はシンプルなMIMEText
+        # 非ASCIIのアドレス（表示名）はMIMETextに任せる
         message = MIMEText(body, "plain", "utf-8")
         message["to"] = to
         message["from"] = from_email
@@ -119,6 +139,36 @@ def create_message(to, subject, body, from_email=FROM_EMAIL, attachments=None):
     return {"raw": raw}
 
 
+def _build_plain_message(to, subject, body, from_email):
+    """text/plain (UTF-8) のメッセージをバイト列として直接組み立てる"""
+    for value in (to, subject, from_email):
+        if "\r" in value or "\n" in value:
+            raise ValueError(f"ヘッダーに改行を含めることはできません: {value!r}")
+
+    # 件名は非ASCIIのときだけ RFC 2047 でエンコード
+    if not subject.isascii():
+        subject = Header(subject, "utf-8").encode(linesep="\r\n")
+
+    body_bytes = body.encode("utf-8")
+    if all(len(line) <= MAX_LINE_BYTES for line in body_bytes.splitlines()):
+        encoding = "8bit"
+    else:
+        # 長すぎる行がある場合はMIMETextと同じくbase64
+        encoding = "base64"
+        body_bytes = base64.encodebytes(body_bytes)
+
+    headers = (
+        f"To: {to}\r\n"
+        f"From: {from_email}\r\n"
+        f"Subject: {subject}\r\n"
+        "MIME-Version: 1.0\r\n"
+        'Content-Type: text/plain; charset="utf-8"\r\n'
+        f"Content-Transfer-Encoding: {encoding}\r\n"
+        "\r\n"
+    )
+    return headers.encode("ascii") + body_bytes
+
+
 def send_message(service, message):
     """メールを送信"""
     return service.users().messages().send(userId="me", body=message).execute()
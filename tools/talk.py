@@ -24,6 +24,7 @@ import tempfile
 import time
 import urllib.request
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import quote
 
@@ -90,38 +91,47 @@ async def synthesize(text: str, voice: str, rate: str) -> bytes:
 # Playback
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=None)
+def _which(cmd: str) -> str | None:
+    """Resolve a player binary to its absolute path (one PATH walk per process)."""
+    return shutil.which(cmd)
+
+
 def play_local(file_path: str) -> str:
     """Play audio on local PC. Tries mpv → ffplay → paplay."""
     pulse_server = "unix:/mnt/wslg/PulseServer"
     env = {**os.environ, "PULSE_SERVER": pulse_server}
 
     # Try ffplay first (best WSLg compatibility)
-    if shutil.which("ffplay"):
+    ffplay = _which("ffplay")
+    if ffplay:
         r = subprocess.run(
-            ["ffplay", "-nodisp", "-autoexit", "-loglevel", "error", file_path],
+            [ffplay, "-nodisp", "-autoexit", "-loglevel", "error", file_path],
             check=False, capture_output=True, env=env,
         )
         if r.returncode == 0:
             return "played via ffplay"
 
     # Try mpv
-    if shutil.which("mpv"):
+    mpv = _which("mpv")
+    if mpv:
         r = subprocess.run(
-            ["mpv", "--no-video", "--no-terminal", file_path],
+            [mpv, "--no-video", "--no-terminal", file_path],
             check=False, capture_output=True, env=env,
         )
         if r.returncode == 0:
             return "played via mpv"
 
     # Try paplay (needs WAV conversion)
-    if shutil.which("paplay") and shutil.which("ffmpeg"):
+    paplay, ffmpeg = _which("paplay"), _which("ffmpeg")
+    if paplay and ffmpeg:
         wav_path = file_path.rsplit(".", 1)[0] + ".wav"
         subprocess.run(
-            ["ffmpeg", "-y", "-i", file_path, wav_path],
+            [ffmpeg, "-y", "-i", file_path, wav_path],
             check=False, capture_output=True,
         )
         r = subprocess.run(
-            ["paplay", wav_path], check=False, capture_output=True, env=env,
+            [paplay, wav_path], check=False, capture_output=True, env=env,
         )
         Path(wav_path).unlink(missing_ok=True)
         if r.returncode == 0:
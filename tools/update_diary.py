@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["python-dotenv", "google-genai", "numpy"]
+# dependencies = ["python-dotenv", "google-genai", "numpy", "orjson"]
 # ///
 """
 日記エントリを追加するスクリプト
@@ -26,25 +26,28 @@ datetimeとtime_periodは自動生成されます（現在時刻から）。
 related_memoriesは自動的に検索されます。
 """
 
-import json
 import argparse
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import fast_json
+
 MEMORY_DIR = Path(__file__).parent.parent / "memory"
 DIARY_FILE = MEMORY_DIR / "diary.json"
 PUBLIC_DIARY_FILE = Path(__file__).parent.parent / "docs" / "data" / "diary.json"
 
 
 def get_datetime_for_sort(entry):
-    """エントリからdatetimeを取得（ソート用）"""
-    if "datetime" in entry:
-        return datetime.strptime(entry["datetime"], "%Y-%m-%d %H:%M:%S")
-    else:
-        # datetimeがない場合はdateから推測
-        date_str = entry.get("date", "1970-01-01")
-        return datetime.strptime(date_str, "%Y-%m-%d")
+    """エントリからdatetimeを取得（ソート用）
+
+    "YYYY-MM-DD HH:MM:SS" は固定幅なので、文字列のまま比較しても時系列順になる
+    （strptime しない）
+    """
+    if entry.get("datetime"):
+        return entry["datetime"]
+    # datetimeがない場合はdateから推測
+    return entry.get("date", "1970-01-01") + " 00:00:00"
 
 
 def get_time_period_from_datetime(dt: datetime) -> str:
@@ -66,13 +69,6 @@ def get_time_period_from_datetime(dt: datetime) -> str:
 
 def add_diary_entry(title: str, content: str, related_memories: list[str] = None, auto_related: bool = True):
     """日記エントリを追加"""
-    # 既存の日記を読み込む
-    if DIARY_FILE.exists():
-        with open(DIARY_FILE, "r", encoding="utf-8") as f:
-            entries = json.load(f)
-    else:
-        entries = []
-
     # datetimeを生成（常に現在時刻を使用）
     now = datetime.now()
     datetime_str = now.strftime("%Y-%m-%d %H:%M:%S")
@@ -116,20 +112,34 @@ def add_diary_entry(title: str, content: str, related_memories: list[str] = None
     if related_memories:
         new_entry["related_memories"] = related_memories
 
-    # 末尾に追加
-    entries.append(new_entry)
-
-    # datetimeでソート（古い順、下が新しい）
-    entries.sort(key=get_datetime_for_sort)
-
-    # 保存
-    with open(DIARY_FILE, "w", encoding="utf-8") as f:
-        json.dump(entries, f, ensure_ascii=False, indent=2)
-
-    # 公開用にもコピー
-    PUBLIC_DIARY_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(PUBLIC_DIARY_FILE, "w", encoding="utf-8") as f:
-        json.dump(entries, f, ensure_ascii=False, indent=2)
+    # 読み込み〜保存はロックを取って行う（同時実行で片方のエントリが消えないように）
+    with fast_json.locked(DIARY_FILE):
+        # 既存の日記を読み込む
+        if DIARY_FILE.exists():
+            entries = fast_json.load_file(DIARY_FILE)
+        else:
+            entries = []
+
+        # 末尾に追加
+        entries.append(new_entry)
+
+        # datetimeでソート（古い順、下が新しい）
+        # diary.jsonは常に全体がソート済み（このスクリプトは古い順、マージドライバは新しい順）
+        # なので、先頭 <= 末尾 <= 新エントリ なら古い順のままでソート不要
+        if len(entries) >= 2 and not (
+            get_datetime_for_sort(entries[0])
+            <= get_datetime_for_sort(entries[-2])
+            <= get_datetime_for_sort(new_entry)
+        ):
+            entries.sort(key=get_datetime_for_sort)
+
+        # 保存（シリアライズは1回だけ）
+        data = fast_json.dumps_bytes(entries)
+        fast_json.atomic_write_bytes(DIARY_FILE, data)
+
+        # 公開用にもコピー
+        PUBLIC_DIARY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fast_json.atomic_write_bytes(PUBLIC_DIARY_FILE, data)
 
     print(f"✅ 日記エントリを追加しました: {datetime_str} - {title}")
     print(f"   保存先: {DIARY_FILE}")
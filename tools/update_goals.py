@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["python-dotenv", "google-genai", "numpy"]
+# dependencies = ["python-dotenv", "google-genai", "numpy", "orjson"]
 # ///
 """
 目標を更新するスクリプト
@@ -23,24 +23,18 @@
     uv run tools/update_goals.py --category short_term --goal "目標" --related "memory/knowledge/foo.md"
 """
 
-import json
 import argparse
 from datetime import datetime
 from pathlib import Path
 
+import fast_json
+
 MEMORY_DIR = Path(__file__).parent.parent / "memory"
 GOALS_FILE = MEMORY_DIR / "goals.json"
 
 
 def add_goal(category: str, goal: str, notes: str = None, related_memories: list[str] = None, auto_related: bool = True):
     """目標を追加"""
-    # 既存の目標を読み込む
-    if GOALS_FILE.exists():
-        with open(GOALS_FILE, "r", encoding="utf-8") as f:
-            goals = json.load(f)
-    else:
-        goals = {"short_term": [], "long_term": [], "completed": []}
-
     # 関連記憶を自動検索（手動指定がなく、auto_related=Trueの場合）
     found_items = []  # 逆リンク用に保持
     if related_memories is None and auto_related:
@@ -81,19 +75,26 @@ def add_goal(category: str, goal: str, notes: str = None, related_memories: list
     if related_memories:
         new_goal["related_memories"] = related_memories
 
-    # カテゴリに追加
-    if category not in goals:
-        goals[category] = []
-    goals[category].append(new_goal)
+    # 読み込み〜保存はロックを取って行う（同時実行で片方の変更が消えないように）
+    with fast_json.locked(GOALS_FILE):
+        # 既存の目標を読み込む
+        if GOALS_FILE.exists():
+            goals = fast_json.load_file(GOALS_FILE)
+        else:
+            goals = {"short_term": [], "long_term": [], "completed": []}
+
+        # カテゴリに追加
+        if category not in goals:
+            goals[category] = []
+        goals[category].append(new_goal)
 
-    # 保存
-    with open(GOALS_FILE, "w", encoding="utf-8") as f:
-        json.dump(goals, f, ensure_ascii=False, indent=2)
+        # 保存（シリアライズは1回だけ）
+        data = fast_json.dumps_bytes(goals)
+        fast_json.atomic_write_bytes(GOALS_FILE, data)
 
-    # 公開用にもコピー
-    PUBLIC_GOALS_FILE = Path(__file__).parent.parent / "docs" / "data" / "goals.json"
-    with open(PUBLIC_GOALS_FILE, "w", encoding="utf-8") as f:
-        json.dump(goals, f, ensure_ascii=False, indent=2)
+        # 公開用にもコピー
+        PUBLIC_GOALS_FILE = Path(__file__).parent.parent / "docs" / "data" / "goals.json"
+        fast_json.atomic_write_bytes(PUBLIC_GOALS_FILE, data)
 
     print(f"✅ 目標を追加しました: {category} - {goal}")
     print(f"   保存先: {GOALS_FILE}")
@@ -138,36 +139,35 @@ def complete_goal(goal_description: str):
         print("❌ エラー: goals.jsonが見つかりません")
         return
     
-    with open(GOALS_FILE, "r", encoding="utf-8") as f:
-        goals = json.load(f)
-    
-    # short_termとlong_termから探す
-    found = False
-    for category in ["short_term", "long_term"]:
-        for i, goal in enumerate(goals.get(category, [])):
-            if goal_description in goal.get("goal", ""):
-                # 完了済みに移動
-                goal["status"] = "completed"
-                goal["completed_at"] = datetime.now().isoformat()
-                goals.setdefault("completed", []).append(goal)
-                goals[category].pop(i)
-                found = True
-                break
-        if found:
-            break
-    
-    if not found:
-        print(f"❌ エラー: 目標が見つかりません: {goal_description}")
-        return
-    
-    # 保存
-    with open(GOALS_FILE, "w", encoding="utf-8") as f:
-        json.dump(goals, f, ensure_ascii=False, indent=2)
-
-    # 公開用にもコピー
-    PUBLIC_GOALS_FILE = Path(__file__).parent.parent / "docs" / "data" / "goals.json"
-    with open(PUBLIC_GOALS_FILE, "w", encoding="utf-8") as f:
-        json.dump(goals, f, ensure_ascii=False, indent=2)
+    with fast_json.locked(GOALS_FILE):
+        goals = fast_json.load_file(GOALS_FILE)
+
+        # short_termとlong_termから最初に一致する目標を1回の走査で探す
+        match = next(
+            ((category, i) for category in ["short_term", "long_term"]
+             for i, goal in enumerate(goals.get(category, []))
+             if goal_description in goal.get("goal", "")),
+            None,
+        )
+
+        if match is None:
+            print(f"❌ エラー: 目標が見つかりません: {goal_description}")
+            return
+
+        # 完了済みに移動
+        category, i = match
+        goal = goals[category].pop(i)
+        goal["status"] = "completed"
+        goal["completed_at"] = datetime.now().isoformat()
+        goals.setdefault("completed", []).append(goal)
+
+        # 保存（シリアライズは1回だけ）
+        data = fast_json.dumps_bytes(goals)
+        fast_json.atomic_write_bytes(GOALS_FILE, data)
+
+        # 公開用にもコピー
+        PUBLIC_GOALS_FILE = Path(__file__).parent.parent / "docs" / "data" / "goals.json"
+        fast_json.atomic_write_bytes(PUBLIC_GOALS_FILE, data)
 
     print(f"✅ 目標を完了にしました: {goal_description}")
     print(f"   保存先: {GOALS_FILE}")